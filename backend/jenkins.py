@@ -6,122 +6,351 @@ Handles Jenkins job triggering with system configuration
 
 import json
 import sys
+import asyncio
+import functools
+import hashlib
+import importlib.util
+import logging
 import os
+import re
 import time
+import shutil
 import subprocess
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Callable, ClassVar, Optional, Deque, Iterator, List, Tuple, Union
+
+if TYPE_CHECKING:
+    import paramiko
+
+logger = logging.getLogger("jenkins")
+
+# Optional dependencies are imported on first use to keep script startup fast
+# SSH falls back to the OpenSSH client / simulated connections without paramiko
+PARAMIKO_AVAILABLE = importlib.util.find_spec("paramiko") is not None
+# Build data decoding falls back to stdlib json without msgspec
+MSGSPEC_AVAILABLE = importlib.util.find_spec("msgspec") is not None
+
+# Process-wide pool of authenticated SSH sessions, keyed by (host, user, port)
+SSH_POOL_MAX_SIZE = 10
+SSH_KEEPALIVE_INTERVAL = 30
+_SSH_POOL: Dict[Tuple[str, str, int], Deque["paramiko.SSHClient"]] = {}
+_SSH_POOL_LOCK = threading.Lock()
+
+def _connect_ssh(host: str, user: str, port: int, password: str) -> "paramiko.SSHClient":
+    """Open a new authenticated SSH session"""
+    import paramiko
+    
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(
+        host,
+        port=port,
+        username=user,
+        password=password,
+        allow_agent=False,
+        look_for_keys=False,
+        timeout=10
+    )
+    # Heartbeat keeps idle pooled sessions from being dropped by firewalls/NAT
+    client.get_transport().set_keepalive(SSH_KEEPALIVE_INTERVAL)
+    return client
+
+def _is_session_alive(client: "paramiko.SSHClient") -> bool:
+    """Check that a pooled SSH session is still usable"""
+    import paramiko
+    
+    transport = client.get_transport()
+    if transport is None or not transport.is_active():
+        return False
+    try:
+        transport.send_ignore()
+        return True
+    except (EOFError, OSError, paramiko.SSHException):
+        return False
+
+@contextmanager
+def borrow(host: str, user: str, port: Any, password: str) -> Iterator["paramiko.SSHClient"]:
+    """Borrow an authenticated SSH session from the pool, connecting only if none is idle"""
+    key = (host, user, int(port))
+    client = None
+    
+    while client is None:
+        with _SSH_POOL_LOCK:
+            idle = _SSH_POOL.get(key)
+            candidate = idle.pop() if idle else None
+        if candidate is None:
+            break
+        if _is_session_alive(candidate):
+            client = candidate
+        else:
+            candidate.close()
+    
+    if client is None:
+        client = _connect_ssh(host, user, int(port), password)
+    
+    try:
+        yield client
+    except Exception:
+        # Don't hand a possibly broken session back to the pool
+        client.close()
+        raise
+    
+    with _SSH_POOL_LOCK:
+        idle = _SSH_POOL.setdefault(key, deque())
+        if len(idle) < SSH_POOL_MAX_SIZE:
+            idle.append(client)
+            client = None
+    if client is not None:
+        client.close()
+
+# OpenSSH multiplexing: one control master per (user, host, port) shared by every ssh call
+SSH_CONTROL_PATH = "/tmp/ssh-%r@%h:%p"
+SSH_CONTROL_PERSIST = 600
+
+def _ssh_command(host: str, user: str, port: Any) -> List[str]:
+    """Build an ssh invocation that attaches to (or starts) a persistent control master"""
+    return [
+        "ssh",
+        "-o", "ControlMaster=auto",
+        "-o", f"ControlPath={SSH_CONTROL_PATH}",
+        "-o", f"ControlPersist={SSH_CONTROL_PERSIST}",
+        "-o", "BatchMode=yes",
+        "-o", "ConnectTimeout=10",
+        "-p", str(port),
+        f"{user}@{host}",
+    ]
+
+# Successful connection tests, keyed by (host, user, port, password hash); reused for CONNECTION_CACHE_TTL seconds
+CONNECTION_CACHE_TTL = 60.0
+_CONNECTION_CACHE: Dict[Tuple[str, str, str, str], float] = {}
+
+def _remember_connection(cache_key: Tuple[str, str, str, str]) -> None:
+    """Record a successful connection test and drop expired ones so the cache stays bounded"""
+    now = time.monotonic()
+    for key in [key for key, checked_at in _CONNECTION_CACHE.items() if now - checked_at >= CONNECTION_CACHE_TTL]:
+        del _CONNECTION_CACHE[key]
+    _CONNECTION_CACHE[cache_key] = now
+
+def _emit(*lines: str) -> None:
+    """Write one phase's progress lines to stdout in a single call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+# Progress goes to the module logger when used as a library; main() sends it to stdout instead
+_PROGRESS_TO_STDOUT = False
+
+def _progress(*lines: str) -> None:
+    """Report one phase's progress lines"""
+    if _PROGRESS_TO_STDOUT:
+        _emit(*lines)
+    elif logger.isEnabledFor(logging.INFO):
+        logger.info("%s", "\n".join(lines))
+
+def _error_result(build_id: Optional[str], message: str) -> Dict[str, Any]:
+    """Build the failure result returned by a trigger"""
+    return {
+        "success": False,
+        "error": message,
+        "build_id": build_id,
+        "timestamp": datetime.now().isoformat()
+    }
+
+class BuildDataError(ValueError):
+    """Build data is not valid JSON or does not match BuildData"""
+
+@dataclass
+class BuildData:
+    """Build request passed to the script by the API"""
+    build_id: Optional[str] = None
+    job_type: Optional[str] = None
+    config: Dict[str, Any] = field(default_factory=dict)
+    command: str = ""
+    system_ip: str = "localhost"
+    system_port: Union[str, int] = "22"
+    system_username: str = "admin"
+    system_password: str = ""
+    force: bool = False
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BuildData":
+        """Create build data from a dict, ignoring unknown keys"""
+        if not isinstance(data, dict):
+            raise BuildDataError("Build data must be a JSON object")
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+def parse_build_data(raw: Union[str, bytes]) -> BuildData:
+    """Decode and validate build data JSON, using msgspec's C decoder when available"""
+    if MSGSPEC_AVAILABLE:
+        import msgspec
+        
+        try:
+            return msgspec.json.decode(raw, type=BuildData)
+        except msgspec.DecodeError as e:
+            raise BuildDataError(str(e)) from e
+    
+    try:
+        return BuildData.from_dict(json.loads(raw))
+    except json.JSONDecodeError as e:
+        raise BuildDataError(str(e)) from e
 
 class JenkinsIntegration:
     """Main class for handling Jenkins operations"""
     
-    def __init__(self, build_data: Dict[str, Any]):
+    __slots__ = (
+        "build_data", "build_id", "job_type", "config", "command",
+        "system_ip", "system_port", "system_username", "system_password"
+    )
+    
+    # Jenkins job mapping
+    job_mapping: ClassVar[Dict[str, str]] = {
+        "JTAF Framework": "jtaf-framework-pipeline",
+        "Floating Framework": "floating-framework-pipeline", 
+        "OS Making": "os-making-pipeline"
+    }
+    
+    # Job-specific parameter builders, keyed by job type
+    _PARAM_BUILDERS: ClassVar[Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]]] = {
+        "JTAF Framework": lambda c: {
+            "TEST_SUITE": c.get("testSuite", ""),
+            "BROWSER": c.get("browser", "chrome"),
+            "ENVIRONMENT": c.get("environment", "dev"),
+            "PARALLEL_EXECUTION": str(c.get("parallelExecution", False)).lower()
+        },
+        "Floating Framework": lambda c: {
+            "FRAMEWORK_VERSION": c.get("version", "latest"),
+            "DEPLOYMENT_TARGET": c.get("target", "staging"),
+            "CONFIGURATION_FILE": c.get("configFile", "default.conf")
+        },
+        "OS Making": lambda c: {
+            "OS_TYPE": c.get("osType", "linux"),
+            "ARCHITECTURE": c.get("architecture", "x64"),
+            "BUILD_TYPE": c.get("buildType", "release")
+        }
+    }
+    
+    def __init__(self, build_data: Union[BuildData, Dict[str, Any]]):
+        if not isinstance(build_data, BuildData):
+            build_data = BuildData.from_dict(build_data)
+        
         self.build_data = build_data
-        self.build_id = build_data.get("build_id")
-        self.job_type = build_data.get("job_type")
-        self.config = build_data.get("config", {})
-        self.command = build_data.get("command", "")
+        self.build_id = build_data.build_id
+        self.job_type = build_data.job_type
+        self.config = build_data.config
+        self.command = build_data.command
         
         # System connection details
-        self.system_ip = build_data.get("system_ip", "localhost")
-        self.system_port = build_data.get("system_port", "22")
-        self.system_username = build_data.get("system_username", "admin")
-        self.system_password = build_data.get("system_password", "")
-        
-        # Jenkins job mapping
-        self.job_mapping = {
-            "JTAF Framework": "jtaf-framework-pipeline",
-            "Floating Framework": "floating-framework-pipeline", 
-            "OS Making": "os-making-pipeline"
-        }
+        self.system_ip = build_data.system_ip
+        self.system_port = build_data.system_port
+        self.system_username = build_data.system_username
+        self.system_password = build_data.system_password
     
     def get_jenkins_job_name(self) -> str:
         """Get the Jenkins job name based on job type"""
         return self.job_mapping.get(self.job_type, "default-pipeline")
     
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _params_for(job_type: Optional[str], config_items: Tuple[Tuple[str, type, Any], ...]) -> Dict[str, Any]:
+        """Build the job-specific parameters for a hashable config snapshot (shared, do not mutate)"""
+        config = {key: value for key, _, value in config_items}
+        return JenkinsIntegration._PARAM_BUILDERS.get(job_type, lambda c: {})(config)
+    
+    def _job_parameters(self) -> Dict[str, Any]:
+        """Get job-specific parameters, memoized on (job_type, config)"""
+        try:
+            # Value types are part of the key, since True == 1 == 1.0 would otherwise share an entry
+            config_items = tuple((key, type(value), value) for key, value in sorted(self.config.items()))
+            return self._params_for(self.job_type, config_items)
+        except TypeError:
+            # Nested config values (lists, dicts) are unhashable and can't be memoized
+            return self._PARAM_BUILDERS.get(self.job_type, lambda c: {})(self.config)
+    
     def prepare_build_parameters(self) -> Dict[str, Any]:
         """Prepare build parameters for Jenkins job"""
-        parameters = {
+        return {
             "BUILD_ID": self.build_id,
             "JOB_TYPE": self.job_type,
             "SYSTEM_IP": self.system_ip,
             "SYSTEM_PORT": self.system_port,
             "SYSTEM_USERNAME": self.system_username,
             "COMMAND": self.command,
+            # Add job-specific parameters
+            **self._job_parameters(),
         }
-        
-        # Add job-specific parameters
-        if self.job_type == "JTAF Framework":
-            parameters.update({
-                "TEST_SUITE": self.config.get("testSuite", ""),
-                "BROWSER": self.config.get("browser", "chrome"),
-                "ENVIRONMENT": self.config.get("environment", "dev"),
-                "PARALLEL_EXECUTION": str(self.config.get("parallelExecution", False)).lower()
-            })
-        elif self.job_type == "Floating Framework":
-            parameters.update({
-                "FRAMEWORK_VERSION": self.config.get("version", "latest"),
-                "DEPLOYMENT_TARGET": self.config.get("target", "staging"),
-                "CONFIGURATION_FILE": self.config.get("configFile", "default.conf")
-            })
-        elif self.job_type == "OS Making":
-            parameters.update({
-                "OS_TYPE": self.config.get("osType", "linux"),
-                "ARCHITECTURE": self.config.get("architecture", "x64"),
-                "BUILD_TYPE": self.config.get("buildType", "release")
-            })
-        
-        return parameters
     
-    def test_system_connection(self) -> bool:
+    def _probe_connection(self) -> None:
+        """Open (or reuse) an SSH session and run a no-op command"""
+        with borrow(self.system_ip, self.system_username, self.system_port, self.system_password) as cli:
+            cli.exec_command("true")
+    
+    async def test_system_connection(self) -> bool:
         """Test connection to the target system"""
         try:
-            # Simulate SSH connection test
-            print(f"Testing connection to {self.system_ip}:{self.system_port}")
+            testing = f"[RUN] Testing connection to {self.system_ip}:{self.system_port}"
             
-            # In a real implementation, you would use paramiko or similar
-            # For now, we'll simulate the connection test
-            time.sleep(1)
+            if not (self.system_ip and self.system_username):
+                _progress(testing, f"[FAIL] Connection to {self.system_ip} failed - missing credentials")
+                return False
             
-            if self.system_ip and self.system_username:
-                print(f"✅ Connection to {self.system_ip} successful")
+            # Re-triggers shortly after a successful test skip the probe unless forced
+            password_hash = hashlib.sha256((self.system_password or "").encode()).hexdigest()
+            cache_key = (self.system_ip, self.system_username, str(self.system_port), password_hash)
+            checked_at = _CONNECTION_CACHE.get(cache_key)
+            if not self.build_data.force and checked_at is not None and time.monotonic() - checked_at < CONNECTION_CACHE_TTL:
+                _progress(testing, f"[OK] Connection to {self.system_ip} successful (verified recently)")
                 return True
+            
+            if PARAMIKO_AVAILABLE:
+                # paramiko is blocking, keep it off the event loop
+                await asyncio.to_thread(self._probe_connection)
             else:
-                print(f"❌ Connection to {self.system_ip} failed - missing credentials")
-                return False
+                # paramiko is not installed, so we'll simulate the connection test
+                await asyncio.sleep(1)
+            
+            _remember_connection(cache_key)
+            _progress(testing, f"[OK] Connection to {self.system_ip} successful")
+            return True
                 
         except Exception as e:
-            print(f"❌ Connection test failed: {str(e)}")
+            _progress(f"[FAIL] Connection test to {self.system_ip}:{self.system_port} failed: {str(e)}")
             return False
     
-    def trigger_jenkins_job(self) -> Dict[str, Any]:
+    async def trigger_jenkins_job(self) -> Dict[str, Any]:
         """Trigger the Jenkins job"""
+        triggered_at = datetime.now().isoformat()
+        triggered_ns = time.time_ns()
+        
         try:
             job_name = self.get_jenkins_job_name()
+            
+            _progress(
+                f"[RUN] Triggering Jenkins job: {job_name}",
+                f"Build ID: {self.build_id}",
+                f"Target System: {self.system_ip}:{self.system_port}"
+            )
+            
+            # Building the parameters is a cheap dict merge, so it runs inline rather than in a thread
             parameters = self.prepare_build_parameters()
+            connected = await self.test_system_connection()
             
-            print(f"🚀 Triggering Jenkins job: {job_name}")
-            print(f"📋 Build ID: {self.build_id}")
-            print(f"🎯 Target System: {self.system_ip}:{self.system_port}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Build parameters: %s", json.dumps(parameters, indent=2))
             
-            # Test system connection first
-            if not self.test_system_connection():
-                return {
-                    "success": False,
-                    "error": "System connection test failed",
-                    "build_id": self.build_id
-                }
+            if not connected:
+                return _error_result(self.build_id, "System connection test failed")
             
             # Simulate Jenkins job trigger
             # In a real implementation, you would use jenkins-python library
-            queue_id = f"queue-{int(time.time())}"
-            build_number = f"build-{int(time.time())}"
+            queue_id = f"queue-{triggered_ns}"
+            build_number = f"build-{triggered_ns}"
             
-            print(f"📦 Job queued with ID: {queue_id}")
-            print(f"🔢 Build number: {build_number}")
+            _progress(f"Job queued with ID: {queue_id}", f"Build number: {build_number}")
             
             # Simulate job execution time
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # Return success result
             result = {
@@ -132,28 +361,24 @@ class JenkinsIntegration:
                 "build_id": self.build_id,
                 "parameters": parameters,
                 "system_target": f"{self.system_ip}:{self.system_port}",
-                "triggered_at": datetime.now().isoformat(),
+                "triggered_at": triggered_at,
                 "message": f"Jenkins job {job_name} triggered successfully"
             }
             
-            print(f"✅ Jenkins job triggered successfully")
+            _progress(f"[OK] Jenkins job {job_name} triggered successfully")
             return result
             
         except Exception as e:
             error_msg = f"Failed to trigger Jenkins job: {str(e)}"
-            print(f"❌ {error_msg}")
-            return {
-                "success": False,
-                "error": error_msg,
-                "build_id": self.build_id
-            }
+            _progress(f"[FAIL] {error_msg}")
+            return _error_result(self.build_id, error_msg)
     
-    def monitor_build_status(self, build_number: str) -> Dict[str, Any]:
+    async def monitor_build_status(self, build_number: str) -> Dict[str, Any]:
         """Monitor the build status (placeholder for future implementation)"""
         try:
-            # This would typically poll Jenkins API for build status
-            # For now, we'll simulate a successful build
-            time.sleep(1)
+            # Finished builds are reported to the API's /api/jenkins/webhook by the
+            # Jenkins Notification Plugin; for now, we'll simulate a successful build
+            await asyncio.sleep(1)
             
             return {
                 "build_number": build_number,
@@ -170,10 +395,19 @@ class JenkinsIntegration:
                 "timestamp": datetime.now().isoformat()
             }
 
-def log_message(message: str, level: str = "INFO") -> None:
-    """Log a message with timestamp"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] [{level}] {message}", file=sys.stderr)
+def configure_logging() -> None:
+    """Log to stderr, and also to a file when JENKINS_LOG_FILE is set"""
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stderr)]
+    log_file = os.getenv("JENKINS_LOG_FILE")
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s] [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        handlers=handlers
+    )
 
 def get_system_config() -> Dict[str, str]:
     """Get system configuration from environment variables"""
@@ -183,84 +417,153 @@ def get_system_config() -> Dict[str, str]:
         "password": os.getenv("SYSTEM_PASSWORD", "")
     }
 
-def execute_remote_command(system_ip: str, username: str, password: str, command: str) -> Dict[str, Any]:
-    """Execute a command on remote system (simulated)"""
-    log_message(f"Executing command on {system_ip}: {command}")
+_BATCH_OUTPUT_PATTERN = re.compile(r"::cmd::(\d+)\n(.*?)(?:::rc::(\d+)\n|\Z)", re.DOTALL)
+
+def _batch_script(commands: List[str]) -> str:
+    """Wrap commands in one shell script that delimits each command's output and exit code"""
+    lines = ["exec 2>&1"]
+    for index, command in enumerate(commands):
+        lines.append(f"echo '::cmd::{index}'")
+        # The script itself arrives on stdin, so commands must not read from it
+        lines.append("{")
+        lines.append(command)
+        lines.append("} </dev/null")
+        lines.append('echo "::rc::$?"')
+    return "\n".join(lines) + "\n"
+
+def _split_batch_output(commands: List[str], output: str, exit_code: int) -> List[Dict[str, Any]]:
+    """Split the combined script output back into per-command results"""
+    results = [{"command": command, "output": "", "exit_code": None} for command in commands]
+    matched = False
+    for match in _BATCH_OUTPUT_PATTERN.finditer(output):
+        matched = True
+        result = results[int(match.group(1))]
+        result["output"] = match.group(2)
+        # A command that ends the script (e.g. `exit 3`) never reaches its marker
+        result["exit_code"] = int(match.group(3)) if match.group(3) is not None else exit_code
+    
+    # No markers means the script never started (e.g. ssh could not connect); keep its error
+    if not matched and results:
+        results[0]["output"] = output
+        results[0]["exit_code"] = exit_code
+    return results
+
+def _simulated_output(system_ip: str, command: str) -> str:
+    """Simulate the output of a command based on its type"""
+    if "build" in command.lower():
+        return f"Build executed successfully on {system_ip}"
+    elif "deploy" in command.lower():
+        return f"Deployment completed on {system_ip}"
+    elif "test" in command.lower():
+        return f"Tests executed on {system_ip}"
+    else:
+        return f"Command executed on {system_ip}: {command}"
+
+def execute_remote_commands(system_ip: str, username: str, password: str, commands: List[str], port: str = "22") -> Dict[str, Any]:
+    """Execute a batch of commands on remote system as one script over a single SSH channel"""
+    logger.info("Executing %d command(s) on %s", len(commands), system_ip)
     
-    # In a real implementation, you would use SSH or other remote execution methods
-    # For now, we'll simulate the execution
     try:
-        # Simulate command execution delay
-        time.sleep(2)
+        started = time.monotonic()
+        script = _batch_script(commands)
+        
+        if PARAMIKO_AVAILABLE:
+            with borrow(system_ip, username, port, password) as cli:
+                stdin, stdout, _ = cli.exec_command("bash -s")
+                stdin.write(script)
+                stdin.channel.shutdown_write()
+                output = stdout.read().decode(errors="replace")
+                exit_code = stdout.channel.recv_exit_status()
+            results = _split_batch_output(commands, output, exit_code)
+        
+        elif shutil.which("ssh") is not None:
+            # OpenSSH client authenticates with keys (BatchMode); the first call starts the control
+            # master (ControlMaster=auto), later calls within ControlPersist reuse it, and once it has
+            # expired the next call simply starts a new one
+            completed = subprocess.run(
+                _ssh_command(system_ip, username, port) + ["bash -s"],
+                input=script,
+                check=False,
+                capture_output=True,
+                text=True
+            )
+            results = _split_batch_output(commands, completed.stdout + completed.stderr, completed.returncode)
         
-        # Simulate different outcomes based on command type
-        if "build" in command.lower():
-            success = True
-            output = f"Build executed successfully on {system_ip}"
-        elif "deploy" in command.lower():
-            success = True
-            output = f"Deployment completed on {system_ip}"
-        elif "test" in command.lower():
-            success = True
-            output = f"Tests executed on {system_ip}"
         else:
-            success = True
-            output = f"Command executed on {system_ip}: {command}"
+            # Simulate command execution delay
+            time.sleep(2)
+            results = [
+                {"command": command, "output": _simulated_output(system_ip, command), "exit_code": 0}
+                for command in commands
+            ]
         
         return {
-            "success": success,
-            "output": output,
-            "exit_code": 0 if success else 1,
-            "execution_time": 2.0
+            "success": all(result["exit_code"] == 0 for result in results),
+            "results": results,
+            "execution_time": round(time.monotonic() - started, 3)
         }
         
     except Exception as e:
-        log_message(f"Command execution failed: {str(e)}", "ERROR")
+        logger.error("Command execution failed: %s", e)
         return {
             "success": False,
-            "output": f"Error executing command: {str(e)}",
-            "exit_code": 1,
+            "results": [],
+            "error": f"Error executing command: {str(e)}",
             "execution_time": 0.0
         }
 
+def execute_remote_command(system_ip: str, username: str, password: str, command: str, port: str = "22") -> Dict[str, Any]:
+    """Execute a single command on remote system"""
+    batch = execute_remote_commands(system_ip, username, password, [command], port)
+    if not batch["results"]:
+        return {
+            "success": False,
+            "output": batch["error"],
+            "exit_code": 1,
+            "execution_time": batch["execution_time"]
+        }
+    
+    result = batch["results"][0]
+    return {
+        "success": batch["success"],
+        "output": result["output"],
+        "exit_code": result["exit_code"],
+        "execution_time": batch["execution_time"]
+    }
+
+def run(build_data: Union[BuildData, Dict[str, Any]]) -> Dict[str, Any]:
+    """Trigger a Jenkins job in the current process and return its result"""
+    return asyncio.run(JenkinsIntegration(build_data).trigger_jenkins_job())
+
 def main():
     """Main entry point for the script"""
+    global _PROGRESS_TO_STDOUT
+    _PROGRESS_TO_STDOUT = True
+    configure_logging()
+    sys.stdout.reconfigure(encoding="utf-8", line_buffering=False)
+    
     try:
         if len(sys.argv) != 2:
             raise ValueError("Usage: python jenkins.py '<build_data_json>'")
         
         # Parse build data from command line argument
-        build_data_json = sys.argv[1]
-        build_data = json.loads(build_data_json)
-        
-        # Initialize Jenkins integration
-        jenkins = JenkinsIntegration(build_data)
+        build_data = parse_build_data(sys.argv[1])
         
         # Trigger the Jenkins job
-        result = jenkins.trigger_jenkins_job()
+        result = run(build_data)
         
         # Output result as JSON for the calling process
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result, separators=(",", ":")))
         
         # Exit with appropriate code
         sys.exit(0 if result.get("success", False) else 1)
         
-    except json.JSONDecodeError as e:
-        error_result = {
-            "success": False,
-            "error": f"Invalid JSON input: {str(e)}",
-            "timestamp": datetime.now().isoformat()
-        }
-        print(json.dumps(error_result, indent=2))
+    except BuildDataError as e:
+        print(json.dumps(_error_result(None, f"Invalid JSON input: {str(e)}"), separators=(",", ":")))
         sys.exit(1)
         
     except Exception as e:
-        error_result = {
-            "success": False,
-            "error": f"Script execution failed: {str(e)}",
-            "timestamp": datetime.now().isoformat()
-        }
-        print(json.dumps(error_result, indent=2))
+        print(json.dumps(_error_result(None, f"Script execution failed: {str(e)}"), separators=(",", ":")))
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Jenkins Integration Service for Framework Hub
+Serves jenkins.py as a long-lived HTTP service so builds don't pay interpreter startup per trigger
+"""
+
+import os
+
+from fastapi import FastAPI, HTTPException, Request
+
+import jenkins
+
+app = FastAPI(
+    title="Framework Hub Jenkins Service",
+    description="Resident Jenkins job trigger for the Framework Hub API",
+    version="1.0.0"
+)
+
+@app.post("/trigger", response_model=dict)
+async def trigger(request: Request):
+    """Trigger a Jenkins job from the same build data jenkins.py accepts on the command line"""
+    try:
+        build_data = jenkins.parse_build_data(await request.body())
+    except jenkins.BuildDataError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON input: {str(e)}")
+    
+    integration = jenkins.JenkinsIntegration(build_data)
+    return await integration.trigger_jenkins_job()
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint"""
+    return {"status": "healthy"}
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        "jenkins_service:app",
+        host=os.getenv("JENKINS_SERVICE_HOST", "127.0.0.1"),
+        port=int(os.getenv("JENKINS_SERVICE_PORT", "9000")),
+        workers=int(os.getenv("JENKINS_SERVICE_WORKERS", "1"))
+    )
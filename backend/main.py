@@ -1,36 +1,110 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 import os
 import json
-import subprocess
+import time
 import asyncio
+import bisect
+import importlib.util
+import itertools
+import multiprocessing
+import tempfile
+import urllib.request
+from collections import defaultdict, deque
 from contextlib import asynccontextmanager
 
+import jenkins
+
 # Try to import MongoDB dependencies, fallback to in-memory storage if not available
 try:
     from motor.motor_asyncio import AsyncIOMotorClient
     from bson import ObjectId
+    from pymongo import ASCENDING, DESCENDING, IndexModel
     MONGODB_AVAILABLE = True
 except ImportError:
     MONGODB_AVAILABLE = False
     print("⚠️  MongoDB dependencies not available. Using in-memory storage.")
 
+# Serialize responses with orjson when available
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+
+# File locks detect sibling workers on in-memory storage (not available on Windows)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
 # Database connection
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 DATABASE_NAME = "framework_hub"
 
+# Connection pool per worker; MONGODB_MAX_POOL_SIZE must cover the concurrent DB-bound requests
+# a worker serves, and operations fail after 5s instead of queueing behind the 30s driver default
+MONGODB_CLIENT_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+    "minPoolSize": int(os.getenv("MONGODB_MIN_POOL_SIZE", "10")),
+    "maxIdleTimeMS": 60000,
+    "serverSelectionTimeoutMS": int(os.getenv("MONGODB_TIMEOUT_MS", "5000")),
+    "connectTimeoutMS": int(os.getenv("MONGODB_TIMEOUT_MS", "5000")),
+    "waitQueueTimeoutMS": int(os.getenv("MONGODB_TIMEOUT_MS", "5000")),
+    "retryWrites": True
+}
+
+# Worker processes serving the API (also read by uvicorn and gunicorn)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Resident Jenkins service (jenkins_service.py); builds run on the API event loop when unset
+JENKINS_SERVICE_URL = os.getenv("JENKINS_SERVICE_URL")
+
 # Global database client and in-memory storage
 db_client: Optional[AsyncIOMotorClient] = None
 database = None
+memory_lock_file = None
 in_memory_storage = {
-    "build_logs": [],
-    "generated_code": [],
+    # Build logs by build_id, plus status/type indexes and (start_time, build_id) keys in ascending order
+    "build_logs_by_id": {},
+    "build_logs_by_status": defaultdict(set),
+    "build_logs_by_type": defaultdict(set),
+    "build_logs_sorted": [],
+    # Newest first; appending past maxlen evicts the oldest entry
+    "generated_code": deque(maxlen=10),
     "system_config": {}
 }
 
+def claim_in_memory_storage() -> bool:
+    """Lock in-memory storage to one uvicorn worker per server (workers are children of its supervisor)"""
+    global memory_lock_file
+    # Only multiprocessing children (uvicorn --workers/--reload) are workers of a supervisor;
+    # unrelated servers can share a parent (a shell, systemd, PID 1) and must not collide
+    supervisor = multiprocessing.parent_process()
+    if not FCNTL_AVAILABLE or supervisor is None:
+        return True
+    
+    memory_lock_file = open(os.path.join(tempfile.gettempdir(), f"framework-hub-memory-{supervisor.pid}.lock"), "w")
+    try:
+        fcntl.flock(memory_lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        memory_lock_file.close()
+        memory_lock_file = None
+        return False
+
+def release_in_memory_storage() -> None:
+    """Drop the in-memory storage lock taken at startup"""
+    global memory_lock_file
+    if memory_lock_file:
+        try:
+            os.unlink(memory_lock_file.name)
+        except OSError:
+            pass
+        memory_lock_file.close()
+        memory_lock_file = None
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -38,16 +112,21 @@ async def lifespan(app: FastAPI):
     
     if MONGODB_AVAILABLE:
         try:
-            db_client = AsyncIOMotorClient(MONGODB_URL)
+            db_client = AsyncIOMotorClient(MONGODB_URL, **MONGODB_CLIENT_OPTIONS)
             database = db_client[DATABASE_NAME]
             
             # Test connection
             await database.command("ping")
             print("✅ Connected to MongoDB")
             
-            # Create indexes
-            await database.build_logs.create_index("build_id", unique=True)
-            await database.generated_code.create_index("created_at")
+            # Create indexes (filtered listings and counts sort by newest start_time)
+            await database.build_logs.create_indexes([
+                IndexModel([("build_id", ASCENDING)], unique=True),
+                IndexModel([("start_time", DESCENDING)]),
+                IndexModel([("status", ASCENDING), ("start_time", DESCENDING)]),
+                IndexModel([("type", ASCENDING), ("start_time", DESCENDING)])
+            ])
+            await database.generated_code.create_index([("created_at", DESCENDING)])
             
         except Exception as e:
             print(f"⚠️  MongoDB connection failed: {e}")
@@ -56,9 +135,17 @@ async def lifespan(app: FastAPI):
     else:
         print("📝 Using in-memory storage")
     
+    # Each worker process would get its own in-memory storage and serve inconsistent reads
+    if database is None and (WEB_CONCURRENCY > 1 or not claim_in_memory_storage()):
+        raise RuntimeError(
+            "In-memory storage cannot be shared by several workers; "
+            "configure MongoDB or run a single worker"
+        )
+    
     yield
     
     # Shutdown
+    release_in_memory_storage()
     if db_client:
         db_client.close()
 
@@ -66,16 +153,17 @@ app = FastAPI(
     title="Framework Hub API",
     description="Backend API for Framework Hub platform",
     version="1.0.0",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse,
     lifespan=lifespan
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:3001", "http://localhost:5173"],
+    allow_origin_regex=r"http://localhost:(3000|3001|5173)",
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
 # Pydantic models
@@ -127,6 +215,15 @@ class JenkinsJobRequest(BaseModel):
     job_type: str
     config: Dict[str, Any]
     command: str
+    force: bool = False  # Re-test the system connection even if it was verified recently
+
+class BuildRequest(BaseModel):
+    build_log: BuildLog
+    jenkins_job: JenkinsJobRequest
+
+class JenkinsBuildNotification(BaseModel):
+    name: str
+    build: Dict[str, Any]
 
 class System(BaseModel):
     id: str
@@ -150,14 +247,55 @@ class SystemConnectionTest(BaseModel):
     username: str
     password: str
 
+# Short-lived /api/stats cache to absorb dashboard polling; writes invalidate it
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "2"))
+stats_cache = {"ts": float("-inf"), "value": None, "version": 0}
+stats_cache_lock = asyncio.Lock()
+
+def invalidate_stats_cache() -> None:
+    """Drop the cached stats after a write"""
+    stats_cache["ts"] = float("-inf")
+    stats_cache["version"] += 1
+
 # Helper functions for in-memory storage
 def generate_id():
     """Generate a simple ID for in-memory storage"""
     return str(int(datetime.now().timestamp() * 1000000))
 
-def build_log_to_response(log: dict) -> BuildLogResponse:
-    """Convert build log dict to response model"""
-    return BuildLogResponse(
+def build_log_sort_key(log: dict) -> tuple:
+    """Ordering key for the in-memory build log index (naive UTC, as MongoDB stores datetimes)"""
+    start_time = log["start_time"]
+    if start_time.tzinfo is not None:
+        start_time = start_time.astimezone(timezone.utc).replace(tzinfo=None)
+    return (start_time, log["build_id"])
+
+def index_build_log(log: dict) -> None:
+    """Add a build log to the in-memory indexes"""
+    # Insert into the sorted keys first so a failure leaves no partial entry behind
+    bisect.insort(in_memory_storage["build_logs_sorted"], build_log_sort_key(log))
+    in_memory_storage["build_logs_by_id"][log["build_id"]] = log
+    in_memory_storage["build_logs_by_status"][log["status"]].add(log["build_id"])
+    in_memory_storage["build_logs_by_type"][log["type"]].add(log["build_id"])
+
+def unindex_build_log(log: dict) -> None:
+    """Remove a build log from the in-memory indexes"""
+    in_memory_storage["build_logs_by_id"].pop(log["build_id"], None)
+    in_memory_storage["build_logs_by_status"][log["status"]].discard(log["build_id"])
+    in_memory_storage["build_logs_by_type"][log["type"]].discard(log["build_id"])
+    
+    sorted_keys = in_memory_storage["build_logs_sorted"]
+    index = bisect.bisect_left(sorted_keys, build_log_sort_key(log))
+    if index < len(sorted_keys) and sorted_keys[index] == build_log_sort_key(log):
+        del sorted_keys[index]
+
+def filter_build_log_page(sorted_keys: list, matching_ids: set, skip: int, limit: int) -> list:
+    """Page of matching build_ids, newest first, from a snapshot of the sorted index"""
+    newest_first = (build_id for _, build_id in reversed(sorted_keys) if build_id in matching_ids)
+    return list(itertools.islice(newest_first, skip, skip + limit))
+
+def build_log_to_response(log: dict, include_log: bool = True) -> BuildLogResponse:
+    """Convert build log dict to response model (stored logs were validated on write)"""
+    return BuildLogResponse.model_construct(
         id=log.get("_id", log.get("id")),
         build_id=log["build_id"],
         type=log["type"],
@@ -167,12 +305,12 @@ def build_log_to_response(log: dict) -> BuildLogResponse:
         config=log["config"],
         command=log.get("command"),
         jenkins_job=log["jenkins_job"],
-        output_log=log.get("output_log")
+        output_log=log.get("output_log") if include_log else None
     )
 
 def generated_code_to_response(code: dict) -> GeneratedCodeResponse:
-    """Convert generated code dict to response model"""
-    return GeneratedCodeResponse(
+    """Convert generated code dict to response model (stored entries were validated on write)"""
+    return GeneratedCodeResponse.model_construct(
         id=code.get("_id", code.get("id")),
         language=code["language"],
         type=code["type"],
@@ -181,6 +319,14 @@ def generated_code_to_response(code: dict) -> GeneratedCodeResponse:
         created_at=code["created_at"]
     )
 
+# List responses are serialized in one pass instead of per item by FastAPI
+build_logs_adapter = TypeAdapter(List[BuildLogResponse])
+generated_code_adapter = TypeAdapter(List[GeneratedCodeResponse])
+
+def list_response(adapter: TypeAdapter, items: list) -> Response:
+    """Serialize a list of response models straight to JSON"""
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
 # Dependency to get database or use in-memory storage
 async def get_storage():
     return database if database else "memory"
@@ -322,14 +468,12 @@ async def trigger_jenkins_job(job_request: JenkinsJobRequest):
             "system_ip": system_config["ip"],
             "system_port": system_config["port"],
             "system_username": system_config["username"],
-            "system_password": system_config["password"]
+            "system_password": system_config["password"],
+            "force": job_request.force
         }
         
-        # Convert to JSON string for command line argument
-        build_data_json = json.dumps(build_data)
-        
-        # Execute jenkins.py script
-        result = await execute_jenkins_script(build_data_json)
+        # Execute the Jenkins trigger
+        result = await execute_jenkins_script(build_data)
         
         return {
             "success": True,
@@ -346,32 +490,100 @@ async def trigger_jenkins_job(job_request: JenkinsJobRequest):
             "build_id": job_request.build_id
         }
 
-async def execute_jenkins_script(build_data_json: str) -> dict:
-    """Execute the jenkins.py script asynchronously"""
+@app.post("/api/builds", response_model=dict)
+async def create_build(build_request: BuildRequest, storage=Depends(get_storage)):
+    """Create the build log and trigger its Jenkins job concurrently"""
+    if build_request.build_log.build_id != build_request.jenkins_job.build_id:
+        raise HTTPException(status_code=400, detail="build_log and jenkins_job must share the same build_id")
+    
+    # Both run to completion; a failed insert must not hide the result of a trigger already sent
+    build_log_result, jenkins_result = await asyncio.gather(
+        create_build_log(build_request.build_log, storage),
+        trigger_jenkins_job(build_request.jenkins_job),
+        return_exceptions=True
+    )
+    if isinstance(build_log_result, HTTPException):
+        build_log_result = {"success": False, "message": build_log_result.detail}
+    elif isinstance(build_log_result, Exception):
+        build_log_result = {"success": False, "message": f"Failed to create build log: {str(build_log_result)}"}
+    else:
+        build_log_result = {"success": True, **build_log_result}
+    if isinstance(jenkins_result, Exception):
+        jenkins_result = {"success": False, "message": f"Jenkins job trigger failed: {str(jenkins_result)}"}
+    
+    return {
+        "success": build_log_result["success"] and jenkins_result["success"],
+        "build_id": build_request.build_log.build_id,
+        "build_log": build_log_result,
+        "jenkins": jenkins_result
+    }
+
+def post_jenkins_service(build_data: dict) -> dict:
+    """Trigger a build on the resident Jenkins service"""
+    request = urllib.request.Request(
+        f"{JENKINS_SERVICE_URL.rstrip('/')}/trigger",
+        data=json.dumps(build_data).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.loads(response.read())
+
+async def execute_jenkins_script(build_data: dict) -> dict:
+    """Run the Jenkins trigger on the resident service or the API event loop"""
     try:
-        # Run jenkins.py script with build data
-        process = await asyncio.create_subprocess_exec(
-            "python3", "jenkins.py", build_data_json,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=os.path.dirname(os.path.abspath(__file__))
-        )
-        
-        stdout, stderr = await process.communicate()
-        
-        if process.returncode == 0:
-            # Parse JSON output from jenkins.py
-            result = json.loads(stdout.decode())
-            return result
+        if JENKINS_SERVICE_URL:
+            result = await asyncio.to_thread(post_jenkins_service, build_data)
         else:
-            error_msg = stderr.decode() if stderr else "Unknown error"
-            raise Exception(f"Jenkins script failed: {error_msg}")
+            # The trigger is I/O-bound and keeps blocking SSH work in threads, so it runs alongside other requests
+            result = await jenkins.JenkinsIntegration(build_data).trigger_jenkins_job()
+        
+        if not result.get("success", False):
+            raise Exception(f"Jenkins script failed: {result.get('error', 'Unknown error')}")
+        return result
             
-    except json.JSONDecodeError as e:
-        raise Exception(f"Failed to parse Jenkins script output: {str(e)}")
     except Exception as e:
         raise Exception(f"Failed to execute Jenkins script: {str(e)}")
 
+# Jenkins build results mapped onto build log statuses
+JENKINS_RESULT_STATUS = {"SUCCESS": "completed"}
+
+@app.post("/api/jenkins/webhook", response_model=dict)
+async def jenkins_webhook(notification: JenkinsBuildNotification, storage=Depends(get_storage)):
+    """Receive build state transitions from the Jenkins Notification Plugin"""
+    build_number = str(notification.build.get("number", ""))
+    if not build_number:
+        raise HTTPException(status_code=400, detail="Missing build number")
+    
+    # Jenkins numbers builds per job; our build_id comes back as the BUILD_ID parameter we triggered with
+    parameters = notification.build.get("parameters") or {}
+    if not isinstance(parameters, dict):
+        raise HTTPException(status_code=400, detail="Build parameters must be an object")
+    build_id = parameters.get("BUILD_ID")
+    result = notification.build.get("status")
+    
+    # Only finished builds carry a status; earlier phases and foreign builds are acknowledged and ignored
+    updated = False
+    if result and build_id:
+        try:
+            await update_build_log(
+                build_id,
+                UpdateBuildStatus(status=JENKINS_RESULT_STATUS.get(result, "failed"), end_time=datetime.utcnow()),
+                storage
+            )
+            updated = True
+        except HTTPException as e:
+            if e.status_code != 404:
+                raise
+    
+    return {
+        "success": True,
+        "job": notification.name,
+        "build_number": build_number,
+        "build_id": build_id,
+        "updated": updated
+    }
+
 # Build Logs endpoints
 @app.post("/api/build-logs", response_model=dict)
 async def create_build_log(build_log: BuildLog, storage=Depends(get_storage)):
@@ -381,44 +593,58 @@ async def create_build_log(build_log: BuildLog, storage=Depends(get_storage)):
         
         if storage == "memory":
             # In-memory storage
+            if build_log_dict["build_id"] in in_memory_storage["build_logs_by_id"]:
+                raise ValueError(f"Build log {build_log_dict['build_id']} already exists")
+            
             build_log_dict["id"] = generate_id()
             build_log_dict["_id"] = build_log_dict["id"]
-            in_memory_storage["build_logs"].append(build_log_dict)
+            index_build_log(build_log_dict)
+            invalidate_stats_cache()
             return {"id": build_log_dict["id"], "message": "Build log created successfully"}
         else:
             # MongoDB storage
             result = await storage.build_logs.insert_one(build_log_dict)
+            invalidate_stats_cache()
             return {"id": str(result.inserted_id), "message": "Build log created successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create build log: {str(e)}")
 
 @app.get("/api/build-logs", response_model=List[BuildLogResponse])
 async def get_build_logs(
-    skip: int = 0, 
-    limit: int = 100, 
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=0),
     status: Optional[str] = None,
     type: Optional[str] = None,
+    include_log: bool = False,
     storage=Depends(get_storage)
 ):
-    """Get build logs with optional filtering"""
+    """Get build logs with optional filtering (output_log only when include_log is set)"""
     try:
         if storage == "memory":
             # In-memory storage
-            logs = in_memory_storage["build_logs"]
+            logs_by_id = in_memory_storage["build_logs_by_id"]
             
-            # Apply filters
-            if status:
-                logs = [log for log in logs if log.get("status") == status]
-            if type:
-                logs = [log for log in logs if log.get("type") == type]
-            
-            # Sort by start_time (newest first)
-            logs = sorted(logs, key=lambda x: x.get("start_time", datetime.min), reverse=True)
-            
-            # Apply pagination
-            logs = logs[skip:skip + limit]
+            if status or type:
+                # Apply filters by intersecting the index sets (always a fresh set)
+                by_status = in_memory_storage["build_logs_by_status"].get(status, set())
+                by_type = in_memory_storage["build_logs_by_type"].get(type, set())
+                if status and type:
+                    matching_ids = by_status & by_type
+                else:
+                    matching_ids = set(by_status if status else by_type)
+                
+                # Scan snapshots off the event loop so large stores don't stall other requests
+                page_ids = await asyncio.to_thread(
+                    filter_build_log_page, list(in_memory_storage["build_logs_sorted"]), matching_ids, skip, limit
+                )
+            else:
+                # Walk the sorted index from the newest entry
+                newest_first = (build_id for _, build_id in reversed(in_memory_storage["build_logs_sorted"]))
+                page_ids = list(itertools.islice(newest_first, skip, skip + limit))
             
-            return [build_log_to_response(log) for log in logs]
+            # Entries deleted while the page was being scanned are dropped
+            page_ids = [build_id for build_id in page_ids if build_id in logs_by_id]
+            return list_response(build_logs_adapter, [build_log_to_response(logs_by_id[build_id], include_log) for build_id in page_ids])
         else:
             # MongoDB storage
             query = {}
@@ -427,53 +653,85 @@ async def get_build_logs(
             if type:
                 query["type"] = type
                 
-            cursor = storage.build_logs.find(query).sort("start_time", -1).skip(skip).limit(limit)
-            build_logs = []
-            
-            async for log in cursor:
-                log["_id"] = str(log["_id"])
-                build_logs.append(BuildLogResponse(**log))
-                
-            return build_logs
+            # Fetch the whole page in a single driver batch, leaving out the log text unless asked for
+            projection = None if include_log else {"output_log": 0}
+            cursor = storage.build_logs.find(query, projection).sort("start_time", -1).skip(skip).limit(limit).batch_size(limit)
+            logs = await cursor.to_list(length=limit)
+            return list_response(build_logs_adapter, [BuildLogResponse.model_construct(id=str(log.pop("_id")), **log) for log in logs])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch build logs: {str(e)}")
 
 @app.get("/api/build-logs/{build_id}", response_model=BuildLogResponse)
-async def get_build_log(build_id: str, storage=Depends(get_storage)):
-    """Get a specific build log by build_id"""
+async def get_build_log(build_id: str, include_log: bool = False, storage=Depends(get_storage)):
+    """Get a specific build log by build_id (output_log is streamed from /log unless include_log is set)"""
     try:
         if storage == "memory":
             # In-memory storage
-            log = next((log for log in in_memory_storage["build_logs"] if log.get("build_id") == build_id), None)
+            log = in_memory_storage["build_logs_by_id"].get(build_id)
             if not log:
                 raise HTTPException(status_code=404, detail="Build log not found")
-            return build_log_to_response(log)
+            return build_log_to_response(log, include_log)
         else:
             # MongoDB storage
-            log = await storage.build_logs.find_one({"build_id": build_id})
+            projection = None if include_log else {"output_log": 0}
+            log = await storage.build_logs.find_one({"build_id": build_id}, projection)
             if not log:
                 raise HTTPException(status_code=404, detail="Build log not found")
             
-            log["_id"] = str(log["_id"])
-            return BuildLogResponse(**log)
+            return BuildLogResponse.model_construct(id=str(log.pop("_id")), **log)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch build log: {str(e)}")
 
+# Chunk size for streamed build output
+OUTPUT_LOG_CHUNK_SIZE = 64 * 1024
+
+async def iter_output_log(output_log: str):
+    """Yield the build output in OUTPUT_LOG_CHUNK_SIZE slices"""
+    for start in range(0, len(output_log), OUTPUT_LOG_CHUNK_SIZE):
+        yield output_log[start:start + OUTPUT_LOG_CHUNK_SIZE]
+
+@app.get("/api/build-logs/{build_id}/log")
+async def get_build_output_log(build_id: str, storage=Depends(get_storage)):
+    """Stream the output log of a build as plain text"""
+    try:
+        if storage == "memory":
+            # In-memory storage
+            log = in_memory_storage["build_logs_by_id"].get(build_id)
+        else:
+            # MongoDB storage (only the log field)
+            log = await storage.build_logs.find_one({"build_id": build_id}, {"_id": 0, "output_log": 1})
+        
+        if log is None:
+            raise HTTPException(status_code=404, detail="Build log not found")
+        
+        return StreamingResponse(iter_output_log(log.get("output_log") or ""), media_type="text/plain")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch build output: {str(e)}")
+
 @app.put("/api/build-logs/{build_id}", response_model=dict)
 async def update_build_log(build_id: str, update_data: UpdateBuildStatus, storage=Depends(get_storage)):
     """Update build log status and other fields"""
     try:
-        update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
+        update_dict = update_data.model_dump(exclude_none=True)
         
         if storage == "memory":
             # In-memory storage
-            log = next((log for log in in_memory_storage["build_logs"] if log.get("build_id") == build_id), None)
+            log = in_memory_storage["build_logs_by_id"].get(build_id)
             if not log:
                 raise HTTPException(status_code=404, detail="Build log not found")
             
+            # Move the log between status index sets when its status changes
+            new_status = update_dict.get("status")
+            if new_status and new_status != log["status"]:
+                in_memory_storage["build_logs_by_status"][log["status"]].discard(build_id)
+                in_memory_storage["build_logs_by_status"][new_status].add(build_id)
+            
             log.update(update_dict)
+            invalidate_stats_cache()
             return {"message": "Build log updated successfully"}
         else:
             # MongoDB storage
@@ -485,6 +743,7 @@ async def update_build_log(build_id: str, update_data: UpdateBuildStatus, storag
             if result.matched_count == 0:
                 raise HTTPException(status_code=404, detail="Build log not found")
                 
+            invalidate_stats_cache()
             return {"message": "Build log updated successfully"}
     except HTTPException:
         raise
@@ -497,15 +756,13 @@ async def delete_build_log(build_id: str, storage=Depends(get_storage)):
     try:
         if storage == "memory":
             # In-memory storage
-            original_length = len(in_memory_storage["build_logs"])
-            in_memory_storage["build_logs"] = [
-                log for log in in_memory_storage["build_logs"] 
-                if log.get("build_id") != build_id
-            ]
-            
-            if len(in_memory_storage["build_logs"]) == original_length:
+            log = in_memory_storage["build_logs_by_id"].get(build_id)
+            if not log:
                 raise HTTPException(status_code=404, detail="Build log not found")
+            
+            unindex_build_log(log)
                 
+            invalidate_stats_cache()
             return {"message": "Build log deleted successfully"}
         else:
             # MongoDB storage
@@ -513,6 +770,7 @@ async def delete_build_log(build_id: str, storage=Depends(get_storage)):
             if result.deleted_count == 0:
                 raise HTTPException(status_code=404, detail="Build log not found")
                 
+            invalidate_stats_cache()
             return {"message": "Build log deleted successfully"}
     except HTTPException:
         raise
@@ -525,12 +783,17 @@ async def clear_all_build_logs(storage=Depends(get_storage)):
     try:
         if storage == "memory":
             # In-memory storage
-            count = len(in_memory_storage["build_logs"])
-            in_memory_storage["build_logs"] = []
+            count = len(in_memory_storage["build_logs_by_id"])
+            in_memory_storage["build_logs_by_id"].clear()
+            in_memory_storage["build_logs_by_status"].clear()
+            in_memory_storage["build_logs_by_type"].clear()
+            in_memory_storage["build_logs_sorted"].clear()
+            invalidate_stats_cache()
             return {"message": f"Deleted {count} build logs"}
         else:
             # MongoDB storage
             result = await storage.build_logs.delete_many({})
+            invalidate_stats_cache()
             return {"message": f"Deleted {result.deleted_count} build logs"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to clear build logs: {str(e)}")
@@ -544,57 +807,42 @@ async def create_generated_code(code: GeneratedCode, storage=Depends(get_storage
         
         if storage == "memory":
             # In-memory storage
-            # Keep only 10 most recent entries
-            if len(in_memory_storage["generated_code"]) >= 10:
-                # Sort by created_at and keep only 9 newest
-                in_memory_storage["generated_code"] = sorted(
-                    in_memory_storage["generated_code"], 
-                    key=lambda x: x.get("created_at", datetime.min), 
-                    reverse=True
-                )[:9]
-            
+            # The bounded deque keeps only the 10 most recent entries
             code_dict["id"] = generate_id()
             code_dict["_id"] = code_dict["id"]
-            in_memory_storage["generated_code"].append(code_dict)
+            in_memory_storage["generated_code"].appendleft(code_dict)
+            invalidate_stats_cache()
             return {"id": code_dict["id"], "message": "Generated code saved successfully"}
         else:
             # MongoDB storage
-            # Check if we have more than 10 entries, remove oldest if needed
-            count = await storage.generated_code.count_documents({})
-            if count >= 10:
-                # Remove oldest entries to keep only 9, so we can add 1 more
-                oldest_entries = await storage.generated_code.find().sort("created_at", 1).limit(count - 9).to_list(length=None)
-                oldest_ids = [entry["_id"] for entry in oldest_entries]
-                await storage.generated_code.delete_many({"_id": {"$in": oldest_ids}})
-            
             result = await storage.generated_code.insert_one(code_dict)
+            
+            # Keep the new entry plus the 9 most recent others; the new entry is never trimmed, even if
+            # its client-set created_at is older, and the lookup returns nothing until the cap is reached
+            overflow = await storage.generated_code.find(
+                {"_id": {"$ne": result.inserted_id}}, {"_id": 1}
+            ).sort("created_at", -1).skip(9).to_list(length=None)
+            if overflow:
+                await storage.generated_code.delete_many({"_id": {"$in": [entry["_id"] for entry in overflow]}})
+            
+            invalidate_stats_cache()
             return {"id": str(result.inserted_id), "message": "Generated code saved successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save generated code: {str(e)}")
 
 @app.get("/api/generated-code", response_model=List[GeneratedCodeResponse])
-async def get_generated_code(skip: int = 0, limit: int = 10, storage=Depends(get_storage)):
+async def get_generated_code(skip: int = Query(0, ge=0), limit: int = Query(10, ge=0), storage=Depends(get_storage)):
     """Get generated code entries (limited to 10 most recent)"""
     try:
         if storage == "memory":
-            # In-memory storage
-            codes = sorted(
-                in_memory_storage["generated_code"], 
-                key=lambda x: x.get("created_at", datetime.min), 
-                reverse=True
-            )
-            codes = codes[skip:skip + limit]
-            return [generated_code_to_response(code) for code in codes]
+            # In-memory storage (already newest first)
+            codes = itertools.islice(in_memory_storage["generated_code"], skip, skip + limit)
+            return list_response(generated_code_adapter, [generated_code_to_response(code) for code in codes])
         else:
             # MongoDB storage
-            cursor = storage.generated_code.find().sort("created_at", -1).skip(skip).limit(limit)
-            code_entries = []
-            
-            async for entry in cursor:
-                entry["_id"] = str(entry["_id"])
-                code_entries.append(GeneratedCodeResponse(**entry))
-                
-            return code_entries
+            cursor = storage.generated_code.find().sort("created_at", -1).skip(skip).limit(limit).batch_size(limit)
+            entries = await cursor.to_list(length=limit)
+            return list_response(generated_code_adapter, [GeneratedCodeResponse.model_construct(id=str(entry.pop("_id")), **entry) for entry in entries])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch generated code: {str(e)}")
 
@@ -617,8 +865,7 @@ async def get_generated_code_by_id(code_id: str, storage=Depends(get_storage)):
             if not entry:
                 raise HTTPException(status_code=404, detail="Generated code not found")
             
-            entry["_id"] = str(entry["_id"])
-            return GeneratedCodeResponse(**entry)
+            return GeneratedCodeResponse.model_construct(id=str(entry.pop("_id")), **entry)
     except HTTPException:
         raise
     except Exception as e:
@@ -630,15 +877,13 @@ async def delete_generated_code(code_id: str, storage=Depends(get_storage)):
     try:
         if storage == "memory":
             # In-memory storage
-            original_length = len(in_memory_storage["generated_code"])
-            in_memory_storage["generated_code"] = [
-                code for code in in_memory_storage["generated_code"] 
-                if code.get("id") != code_id
-            ]
-            
-            if len(in_memory_storage["generated_code"]) == original_length:
+            code = next((code for code in in_memory_storage["generated_code"] if code.get("id") == code_id), None)
+            if not code:
                 raise HTTPException(status_code=404, detail="Generated code not found")
+            
+            in_memory_storage["generated_code"].remove(code)
                 
+            invalidate_stats_cache()
             return {"message": "Generated code deleted successfully"}
         else:
             # MongoDB storage
@@ -649,6 +894,7 @@ async def delete_generated_code(code_id: str, storage=Depends(get_storage)):
             if result.deleted_count == 0:
                 raise HTTPException(status_code=404, detail="Generated code not found")
                 
+            invalidate_stats_cache()
             return {"message": "Generated code deleted successfully"}
     except HTTPException:
         raise
@@ -662,11 +908,13 @@ async def clear_all_generated_code(storage=Depends(get_storage)):
         if storage == "memory":
             # In-memory storage
             count = len(in_memory_storage["generated_code"])
-            in_memory_storage["generated_code"] = []
+            in_memory_storage["generated_code"].clear()
+            invalidate_stats_cache()
             return {"message": f"Deleted {count} generated code entries"}
         else:
             # MongoDB storage
             result = await storage.generated_code.delete_many({})
+            invalidate_stats_cache()
             return {"message": f"Deleted {result.deleted_count} generated code entries"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to clear generated code: {str(e)}")
@@ -674,21 +922,42 @@ async def clear_all_generated_code(storage=Depends(get_storage)):
 # Statistics endpoint
 @app.get("/api/stats", response_model=dict)
 async def get_stats(storage=Depends(get_storage)):
-    """Get platform statistics"""
+    """Get platform statistics, cached for STATS_CACHE_TTL seconds"""
+    if time.monotonic() - stats_cache["ts"] < STATS_CACHE_TTL:
+        return stats_cache["value"]
+    
+    async with stats_cache_lock:
+        # Another request may have refreshed the cache while we waited
+        if time.monotonic() - stats_cache["ts"] < STATS_CACHE_TTL:
+            return stats_cache["value"]
+        
+        version = stats_cache["version"]
+        value = await compute_stats(storage)
+        
+        # Don't cache a result that a concurrent write has already made stale
+        if version == stats_cache["version"]:
+            stats_cache["value"] = value
+            stats_cache["ts"] = time.monotonic()
+        return value
+
+async def compute_stats(storage) -> dict:
+    """Compute platform statistics from storage"""
     try:
         if storage == "memory":
             # In-memory storage
-            build_logs = in_memory_storage["build_logs"]
+            # Counts are the sizes of the status/type indexes, kept current on every write
+            by_status = in_memory_storage["build_logs_by_status"]
+            by_type = in_memory_storage["build_logs_by_type"]
             generated_code = in_memory_storage["generated_code"]
             
-            total_builds = len(build_logs)
-            running_builds = len([log for log in build_logs if log.get("status") == "running"])
-            completed_builds = len([log for log in build_logs if log.get("status") == "completed"])
-            failed_builds = len([log for log in build_logs if log.get("status") == "failed"])
+            total_builds = len(in_memory_storage["build_logs_by_id"])
+            running_builds = len(by_status.get("running", ()))
+            completed_builds = len(by_status.get("completed", ()))
+            failed_builds = len(by_status.get("failed", ()))
             
-            jtaf_builds = len([log for log in build_logs if log.get("type") == "JTAF Framework"])
-            floating_builds = len([log for log in build_logs if log.get("type") == "Floating Framework"])
-            os_builds = len([log for log in build_logs if log.get("type") == "OS Making"])
+            jtaf_builds = len(by_type.get("JTAF Framework", ()))
+            floating_builds = len(by_type.get("Floating Framework", ()))
+            os_builds = len(by_type.get("OS Making", ()))
             
             return {
                 "build_logs": {
@@ -709,30 +978,34 @@ async def get_stats(storage=Depends(get_storage)):
             }
         else:
             # MongoDB storage
-            # Build logs stats
-            total_builds = await storage.build_logs.count_documents({})
-            running_builds = await storage.build_logs.count_documents({"status": "running"})
-            completed_builds = await storage.build_logs.count_documents({"status": "completed"})
-            failed_builds = await storage.build_logs.count_documents({"status": "failed"})
-            
-            # Generated code stats
-            total_generated_code = await storage.generated_code.count_documents({})
+            # Build logs stats in a single aggregation, concurrently with the generated code count
+            pipeline = [{
+                "$facet": {
+                    "total": [{"$count": "n"}],
+                    "by_status": [{"$group": {"_id": "$status", "n": {"$sum": 1}}}],
+                    "by_type": [{"$group": {"_id": "$type", "n": {"$sum": 1}}}]
+                }
+            }]
+            facets, total_generated_code = await asyncio.gather(
+                storage.build_logs.aggregate(pipeline).to_list(length=1),
+                storage.generated_code.count_documents({})
+            )
             
-            # Build types stats
-            jtaf_builds = await storage.build_logs.count_documents({"type": "JTAF Framework"})
-            floating_builds = await storage.build_logs.count_documents({"type": "Floating Framework"})
-            os_builds = await storage.build_logs.count_documents({"type": "OS Making"})
+            facet = facets[0] if facets else {}
+            total = facet.get("total", [])
+            by_status = {group["_id"]: group["n"] for group in facet.get("by_status", [])}
+            by_type = {group["_id"]: group["n"] for group in facet.get("by_type", [])}
             
             return {
                 "build_logs": {
-                    "total": total_builds,
-                    "running": running_builds,
-                    "completed": completed_builds,
-                    "failed": failed_builds,
+                    "total": total[0]["n"] if total else 0,
+                    "running": by_status.get("running", 0),
+                    "completed": by_status.get("completed", 0),
+                    "failed": by_status.get("failed", 0),
                     "by_type": {
-                        "jtaf": jtaf_builds,
-                        "floating": floating_builds,
-                        "os_making": os_builds
+                        "jtaf": by_type.get("JTAF Framework", 0),
+                        "floating": by_type.get("Floating Framework", 0),
+                        "os_making": by_type.get("OS Making", 0)
                     }
                 },
                 "generated_code": {
@@ -758,4 +1031,14 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # "auto" picks uvloop/httptools when installed (uvicorn[standard], except uvloop on Windows)
+    # and falls back to asyncio/h11; more than one worker requires MongoDB
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        workers=WEB_CONCURRENCY,
+        log_level="warning"
+    )